@@ -1,104 +1,579 @@
 import streamlit as st
 import os
-import re
-from urllib.parse import urlparse, parse_qs
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.formatters import TextFormatter
+import time
+import json
+import asyncio
+import threading
+import hashlib
+import requests
+from requests.adapters import HTTPAdapter
+import cache
+import semantic_cache
+from transcript_utils import (
+    TRANSCRIPT_CHUNK_CHARS,
+    parse_youtube_url,
+    compact_transcript,
+    split_transcript,
+)
+from youtube_transcript_api import (
+    YouTubeTranscriptApi,
+    NoTranscriptFound,
+    TranscriptsDisabled,
+    VideoUnavailable,
+)
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+@st.cache_resource
+def load_environment():
+    """
+    Load .env into the environment once per process instead of on every script rerun
+    """
+    return load_dotenv()
+
+# Load environment variables (GOOGLE_API_KEY, and optionally REDIS_URL for cache.py)
+load_environment()
+
+# Gemini model used for summarization (flash-lite is much faster for bullet-point summaries)
+MODEL_NAME = "gemini-2.5-flash-lite"
+
+# How long Streamlit keeps cached transcripts and responses (seconds)
+CACHE_TTL = 86400
+
+# Maximum number of transcripts fetched from YouTube at the same time
+MAX_CONCURRENT_FETCHES = 10
+
+# Faster, cheaper model used to summarize the individual parts of long transcripts
+MAP_MODEL_NAME = "gemini-2.5-flash-lite"
+
+# Transcripts longer than this are summarized with map-reduce
+MAP_REDUCE_THRESHOLD_CHARS = 4 * TRANSCRIPT_CHUNK_CHARS
+
+# Maximum number of Gemini requests running at the same time, across the whole process
+MAX_CONCURRENT_GENERATIONS = 8
+
+# How long Gemini keeps an uploaded transcript in its context cache (seconds)
+CONTEXT_CACHE_TTL = 3600
+
+# Gemini rejects context caches below ~1024 tokens, so short transcripts are sent inline
+# (~4 characters per token, doubled for headroom on token-dense transcripts)
+MIN_CONTEXT_CACHE_CHARS = 8192
+
+# Static instruction shared by every summary, kept separate from the transcript body
+SUMMARY_INSTRUCTION = """
+You summarize YouTube video transcripts.
+Focus on the main points, key insights, and important information discussed in the video.
+"""
 
-# Initialize Gemini client
-client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+# Task prompts for each summary style; all of them reuse the same cached transcript
+SUMMARY_STYLES = {
+    "Comprehensive": "Please provide a comprehensive summary of the video transcript. "
+                     "Make the summary clear, concise, and well-structured with bullet points for key topics.",
+    "Brief": "Please summarize the video transcript in one short paragraph of 3-5 sentences.",
+    "Key Takeaways": "Please list the 5-10 most important takeaways from the video transcript as bullet points.",
+}
+DEFAULT_SUMMARY_STYLE = "Comprehensive"
 
-def extract_video_id(youtube_url):
+# Bump whenever the prompts change so cached summaries from older prompts are not reused
+PROMPT_VERSION = "1"
+
+# Structured output for summaries that are not streamed, rendered back to markdown;
+# "Brief" is a single paragraph, which a summary-plus-bullets schema would reshape
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "bullets": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["summary", "bullets"],
+}
+STRUCTURED_STYLES = {"Comprehensive", "Key Takeaways"}
+
+@st.cache_resource
+def get_gemini_client():
     """
-    Extract video ID from various YouTube URL formats
+    Create the Gemini client once and share it across reruns and sessions
     """
-    # Regular expression patterns for different YouTube URL formats
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/v\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, youtube_url)
-        if match:
-            return match.group(1)
+    return genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+@st.cache_resource
+def get_generation_limiter():
+    """
+    Create the one semaphore that caps in-flight Gemini requests for every session and thread
+    """
+    # Batch workers run their own map steps, so per-call asyncio semaphores would multiply
+    return threading.BoundedSemaphore(MAX_CONCURRENT_GENERATIONS)
+
+@st.cache_resource
+def get_transcript_api():
+    """
+    Create one YouTube transcript client whose HTTP session keeps connections alive
+    """
+    session = requests.Session()
+    # Size the pool so every concurrent fetch gets its own kept-alive connection
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_FETCHES)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return YouTubeTranscriptApi(http_client=session)
+
+def make_cache_key(kind, *parts):
+    """
+    Build a stable cache key from the given string parts, hashing long content
+    """
+    digest = hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+    return f"yt:{kind}:{digest}:{PROMPT_VERSION}"
+
+def summary_cache_key(video_id, style):
+    """
+    Build the cache key of a finished (summary, transcript lines) result for a video
+    """
+    return f"yt:summary:{video_id}:{MODEL_NAME}:{style}:{PROMPT_VERSION}"
+
+def summary_format(style, structured):
+    """
+    Name the output format a summary is generated in, so one path never serves the other's
+    """
+    return "structured" if structured and style in STRUCTURED_STYLES else "markdown"
+
+def transcript_cache_key(transcript_text, style, structured):
+    """
+    Build the cache key of a summary generated from this exact transcript
+    """
+    return make_cache_key(
+        "transcript", MODEL_NAME, style, summary_format(style, structured), transcript_text
+    )
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_transcript_lines(video_id):
+    """
+    Fetch the caption lines of a YouTube transcript (errors are raised, so they are never cached)
+    """
+    transcript_list = get_transcript_api().fetch(video_id)
     
-    return None
+    # Keep only the raw text; formatting for display is deferred until it is shown
+    return tuple(snippet.text for snippet in transcript_list)
 
 def get_video_transcript(video_id):
     """
-    Get transcript for a YouTube video
+    Get transcript caption lines for a YouTube video
     """
     try:
-        # Get transcript
-        transcript_list = YouTubeTranscriptApi().fetch(video_id)
+        transcript_lines = fetch_transcript_lines(video_id)
         
-        # Format transcript as plain text
-        formatter = TextFormatter()
-        transcript_text = formatter.format_transcript(transcript_list)
-        
-        return transcript_text, None
+        return transcript_lines, None
+    except (TranscriptsDisabled, NoTranscriptFound):
+        return None, "No transcript available for this video. The video may not have captions enabled."
+    except VideoUnavailable:
+        return None, "Video is unavailable or private."
     except Exception as e:
-        error_msg = str(e)
-        if "No transcript found" in error_msg or "Transcript disabled" in error_msg:
-            return None, "No transcript available for this video. The video may not have captions enabled."
-        elif "Video unavailable" in error_msg:
-            return None, "Video is unavailable or private."
-        else:
-            return None, f"Error retrieving transcript: {error_msg}"
+        return None, f"Error retrieving transcript: {str(e)}"
+
+async def fetch_transcripts(video_ids):
+    """
+    Fetch transcripts for several videos concurrently instead of one after another
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    
+    async def fetch(video_id):
+        async with semaphore:
+            # youtube-transcript-api is blocking, so each fetch runs in a worker thread
+            return await loop.run_in_executor(None, get_video_transcript, video_id)
+    
+    results = await asyncio.gather(*[fetch(video_id) for video_id in video_ids])
+    return dict(zip(video_ids, results))
+
+def warm_up_gemini(client):
+    """
+    Open the HTTPS connection to Gemini ahead of the first generation request
+    """
+    try:
+        # A cheap metadata request pays the DNS/TLS/auth setup cost up front
+        client.models.get(model=MODEL_NAME)
+    except Exception:
+        # Warmup is best effort; the real request will surface any error
+        pass
+
+async def fetch_transcripts_with_warmup(video_ids):
+    """
+    Fetch transcripts while warming up the Gemini connection in parallel
+    """
+    loop = asyncio.get_running_loop()
+    transcripts, _ = await asyncio.gather(
+        fetch_transcripts(video_ids),
+        loop.run_in_executor(None, warm_up_gemini, get_gemini_client())
+    )
+    return transcripts
+
+def stream_text(prompt, model=MODEL_NAME, cached_content=None, response_schema=None):
+    """
+    Stream a Gemini generation, yielding text as soon as each chunk arrives
+    """
+    config_options = {}
+    if cached_content:
+        config_options["cached_content"] = cached_content
+    if response_schema:
+        config_options["response_mime_type"] = "application/json"
+        config_options["response_schema"] = response_schema
+    config = types.GenerateContentConfig(**config_options) if config_options else None
+    
+    # The request counts against the limit until its stream is fully read
+    with get_generation_limiter():
+        response = get_gemini_client().models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config=config
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
 
-def generate_summary(transcript_text):
+def get_context_cache(video_id, transcript_text, style):
     """
-    Generate AI-powered summary using Google Gemini
+    Return the name of the transcript's Gemini context cache, creating it on the second
+    summary style requested for a video (None means send the transcript inline)
     """
+    if len(transcript_text) < MIN_CONTEXT_CACHE_CHARS:
+        return None
+    
+    state_key = f"context_cache_{video_id}"
+    entry = st.session_state.get(state_key)
+    if entry and entry["expires_at"] > time.time():
+        return entry["name"]
+    
+    # Creating a cache costs an extra round trip plus storage, which a single summary
+    # never earns back, so the first style is sent inline
+    styles = st.session_state.setdefault(f"context_cache_styles_{video_id}", set())
+    styles.add(style)
+    if len(styles) < 2:
+        return None
+    
     try:
+        cached = get_gemini_client().caches.create(
+            model=MODEL_NAME,
+            config=types.CreateCachedContentConfig(
+                system_instruction=SUMMARY_INSTRUCTION,
+                contents=[transcript_text],
+                ttl=f"{CONTEXT_CACHE_TTL}s"
+            )
+        )
+    except Exception:
+        # Caching is only an optimization; fall back to sending the transcript inline
+        return None
+    
+    # Leave a small margin so we never reference a cache that is about to expire
+    st.session_state[state_key] = {
+        "name": cached.name,
+        "expires_at": time.time() + CONTEXT_CACHE_TTL - 60,
+    }
+    return cached.name
+
+def summarize_transcript_part(client, part, index, total):
+    """
+    Summarize one part of a long transcript with the faster map model
+    """
+    prompt = f"""
+    {SUMMARY_INSTRUCTION}
+    Below is part {index + 1} of {total} of a long YouTube video transcript.
+    Summarize the key points of this part as concise bullet points.
+    
+    Transcript part:
+    {part}
+    """
+    
+    def generate():
+        with get_generation_limiter():
+            response = client.models.generate_content(
+                model=MAP_MODEL_NAME,
+                contents=prompt
+            )
+        return response.text or ""
+    
+    # Parts are cached individually, so switching summary style skips the map step
+    return cache.get_or_set(make_cache_key("part", MAP_MODEL_NAME, part), generate)
+
+async def summarize_transcript_parts(parts):
+    """
+    Summarize every part of a long transcript concurrently (the map step)
+    """
+    loop = asyncio.get_running_loop()
+    client = get_gemini_client()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+    
+    async def summarize(index, part):
+        async with semaphore:
+            # Run on the shared sync client so every part reuses its warm connection pool
+            return await loop.run_in_executor(
+                None, summarize_transcript_part, client, part, index, len(parts)
+            )
+    
+    return await asyncio.gather(*[summarize(index, part) for index, part in enumerate(parts)])
+
+def format_structured_summary(response_text):
+    """
+    Render a JSON summary matching SUMMARY_SCHEMA as markdown
+    """
+    try:
+        data = json.loads(response_text)
+    except ValueError:
+        # Fall back to whatever the model returned rather than losing the summary
+        return response_text
+    
+    bullets = "\n".join(f"- {bullet}" for bullet in data.get("bullets", []))
+    return f"{data.get('summary', '')}\n\n{bullets}".strip()
+
+def semantic_cache_key(style, structured):
+    """
+    Build the key that near-duplicate summaries must share to be reused
+    """
+    return f"{MODEL_NAME}:{style}:{summary_format(style, structured)}:{PROMPT_VERSION}"
+
+def has_similar_candidates():
+    """
+    Check whether the semantic cache holds any summaries worth searching
+    """
+    try:
+        return semantic_cache.has_entries()
+    except Exception:
+        # Similarity search is only an optimization; an unreadable store counts as empty
+        return False
+
+def find_similar_summary(transcript_lines, style=DEFAULT_SUMMARY_STYLE, structured=False):
+    """
+    Return the summary of a near-duplicate transcript (e.g. a re-upload), or None
+    """
+    transcript_text = " ".join(transcript_lines)
+    
+    # An exact match is a summary of this very transcript, which stream_summary serves itself
+    if cache.get_cached(transcript_cache_key(transcript_text, style, structured)) is not None:
+        return None
+    
+    try:
+        return semantic_cache.lookup(
+            compact_transcript(transcript_text), semantic_cache_key(style, structured)
+        )
+    except Exception:
+        # Similarity search is only an optimization; any failure counts as a miss
+        return None
+
+def stream_summary(transcript_text, video_id, style=DEFAULT_SUMMARY_STYLE, use_context_cache=True,
+                   structured=False):
+    """
+    Stream an AI-powered summary from Google Gemini (errors are raised to the caller);
+    with structured=True the JSON answer is rendered to markdown and yielded once
+    """
+    # Styles outside STRUCTURED_STYLES always use the plain markdown prompt
+    structured = summary_format(style, structured) == "structured"
+    
+    # Identical transcripts always produce the same prompt, so reuse the cached summary
+    cache_key = transcript_cache_key(transcript_text, style, structured)
+    cached_summary = cache.get_cached(cache_key)
+    if cached_summary is not None:
+        yield cached_summary
+        return
+    
+    # Everything sent to Gemini (and stored for similarity search) uses the compacted text
+    transcript_text = compact_transcript(transcript_text)
+    
+    task_prompt = SUMMARY_STYLES[style]
+    response_schema = SUMMARY_SCHEMA if structured else None
+    chunks = []
+    
+    if len(transcript_text) > MAP_REDUCE_THRESHOLD_CHARS:
+        # Long transcripts: summarize the parts concurrently, then reduce them below
+        parts = split_transcript(transcript_text)
+        part_summaries = asyncio.run(summarize_transcript_parts(parts))
+        transcript_label = "Summaries of consecutive parts of the transcript, in order"
+        summary_input = "\n\n".join(
+            f"Part {index + 1}:\n{part_summary}" for index, part_summary in enumerate(part_summaries)
+        )
+        cached_content = None
+    else:
+        transcript_label = "Transcript"
+        summary_input = transcript_text
+        # The context cache lives in session state, which worker threads cannot use
+        cached_content = get_context_cache(video_id, transcript_text, style) if use_context_cache else None
+    
+    if cached_content:
+        try:
+            for text in stream_text(task_prompt, cached_content=cached_content,
+                                    response_schema=response_schema):
+                chunks.append(text)
+                if not structured:
+                    yield text
+        except Exception:
+            if chunks:
+                raise
+            # The context cache may have been evicted early; retry with the transcript inline
+            st.session_state.pop(f"context_cache_{video_id}", None)
+            cached_content = None
+    
+    if not cached_content:
         prompt = f"""
-        Please provide a comprehensive summary of the following YouTube video transcript. 
-        Focus on the main points, key insights, and important information discussed in the video.
-        Make the summary clear, concise, and well-structured with bullet points for key topics.
+        {SUMMARY_INSTRUCTION}
+        {task_prompt}
         
-        Transcript:
-        {transcript_text}
+        {transcript_label}:
+        {summary_input}
         """
-        
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
-        
-        return response.text if response.text else "Failed to generate summary."
+        for text in stream_text(prompt, response_schema=response_schema):
+            chunks.append(text)
+            if not structured:
+                yield text
+    
+    summary = "".join(chunks)
+    if summary and structured:
+        summary = format_structured_summary(summary)
+        yield summary
+    
+    if summary:
+        cache.set_cached(cache_key, summary)
+        try:
+            semantic_cache.add(transcript_text, semantic_cache_key(style, structured), summary)
+        except Exception:
+            # Similarity search is only an optimization; never lose a summary over it
+            pass
+
+def generate_summary(transcript_lines, video_id, style=DEFAULT_SUMMARY_STYLE):
+    """
+    Generate a complete AI-powered summary without streaming (safe to run in a worker thread)
+    """
+    try:
+        summary = "".join(stream_summary(
+            " ".join(transcript_lines), video_id, style, use_context_cache=False, structured=True
+        ))
     except Exception as e:
-        return f"Error generating summary: {str(e)}"
+        return None, f"Error generating summary: {str(e)}"
+    
+    if not summary:
+        return None, "Failed to generate summary."
+    
+    return summary, None
+
+async def generate_summaries(transcripts, style=DEFAULT_SUMMARY_STYLE):
+    """
+    Generate summaries for several videos concurrently, keyed by video ID
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+    
+    async def generate(video_id, transcript_lines):
+        async with semaphore:
+            return await loop.run_in_executor(
+                None, generate_summary, transcript_lines, video_id, style
+            )
+    
+    video_ids = list(transcripts)
+    results = await asyncio.gather(
+        *[generate(video_id, transcripts[video_id]) for video_id in video_ids]
+    )
+    return dict(zip(video_ids, results))
 
 def get_video_title(video_id):
     """
-    Extract video title by attempting to get transcript metadata
+    Build the display title for a video without any extra network request
     """
-    try:
-        # Try to get transcript which sometimes includes video metadata
-        transcript_list = YouTubeTranscriptApi().list(video_id)
-        # This is a simple approach - in a real app you might use YouTube Data API
-        return f"Video ID: {video_id}"
-    except:
-        return f"Video ID: {video_id}"
+    # A real title would need the YouTube Data API or oEmbed; the ID is enough here
+    return f"Video ID: {video_id}"
 
-def validate_youtube_url(url):
+def recall_result(video_id, style):
     """
-    Validate if the provided URL is a valid YouTube URL
+    Look up a finished (summary, transcript lines) result, checking this session first
     """
-    youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com', 'm.youtube.com']
+    summary = st.session_state.get(f"summary_{style}_{video_id}")
+    transcript_lines = st.session_state.get(f"transcript_{video_id}")
+    if summary is not None and transcript_lines is not None:
+        return summary, transcript_lines
     
-    try:
-        parsed_url = urlparse(url)
-        return parsed_url.netloc.lower() in youtube_domains
-    except:
-        return False
+    return cache.get_cached(summary_cache_key(video_id, style))
+
+def remember_result(video_id, style, summary, transcript_lines):
+    """
+    Keep a finished result in session state so reruns (e.g. download clicks) never recompute it
+    """
+    st.session_state[f"summary_{style}_{video_id}"] = summary
+    st.session_state[f"transcript_{video_id}"] = transcript_lines
+
+def store_result(video_id, style, summary, transcript_lines):
+    """
+    Save a newly generated result in session state and in the shared cache
+    """
+    remember_result(video_id, style, summary, transcript_lines)
+    cache.set_cached(summary_cache_key(video_id, style), (summary, transcript_lines))
+
+def render_video_error(video_id, error):
+    """
+    Show why a video could not be summarized
+    """
+    st.subheader("Video Information")
+    st.info(f"**Video:** {get_video_title(video_id)}")
+    st.error(f"❌ {error}")
+
+def render_video_result(video_id, summary, transcript_lines):
+    """
+    Show the summary (a string, or a stream of text chunks rendered as they arrive)
+    and transcript of one video, returning (summary, None) or (None, error) on failure
+    """
+    # Show video information
+    st.subheader("Video Information")
+    video_title = get_video_title(video_id)
+    st.info(f"**Video:** {video_title}")
+    
+    # Create tabs for transcript and summary
+    tab1, tab2 = st.tabs(["📝 AI Summary", "📄 Full Transcript"])
+    
+    with tab1:
+        st.subheader("AI-Generated Summary")
+        if isinstance(summary, str):
+            st.markdown(summary)
+        else:
+            try:
+                summary = st.write_stream(summary)
+            except Exception as e:
+                error = f"Error generating summary: {str(e)}"
+                st.error(f"❌ {error}")
+                return None, error
+            
+            if not summary:
+                error = "Failed to generate summary."
+                st.error(f"❌ {error}")
+                return None, error
+        
+        # Download summary button
+        st.download_button(
+            label="📥 Download Summary",
+            data=summary,
+            file_name=f"youtube_summary_{video_id}.txt",
+            mime="text/plain",
+            key=f"download_summary_{video_id}"
+        )
+    
+    with tab2:
+        st.subheader("Full Transcript")
+        # Only the display copy is line-formatted; Gemini receives a space-joined transcript
+        transcript_text = "\n".join(transcript_lines)
+        
+        # The large text area is only rendered once the user asks for it
+        if st.toggle("Show full transcript", key=f"show_transcript_{video_id}"):
+            st.text_area(
+                "Transcript:",
+                value=transcript_text,
+                height=400,
+                disabled=True,
+                key=f"transcript_view_{video_id}"
+            )
+        
+        # Download transcript button
+        st.download_button(
+            label="📥 Download Transcript",
+            data=transcript_text,
+            file_name=f"youtube_transcript_{video_id}.txt",
+            mime="text/plain",
+            key=f"download_transcript_{video_id}"
+        )
+    
+    return summary, None
 
 def main():
     # Page configuration
@@ -116,9 +591,9 @@ def main():
     with st.sidebar:
         st.header("How to use:")
         st.markdown("""
-        1. **Paste YouTube URL** - Copy any YouTube video URL
-        2. **Click Summarize** - The app will extract the transcript
-        3. **Get Summary** - AI will generate a comprehensive summary
+        1. **Paste YouTube URLs** - One YouTube video URL per line
+        2. **Click Summarize** - The app will extract the transcripts
+        3. **Get Summary** - AI will generate a summary for each video
         
         **Supported URL formats:**
         - youtube.com/watch?v=VIDEO_ID
@@ -133,12 +608,23 @@ def main():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # URL input
-        st.subheader("Enter YouTube Video URL")
-        youtube_url = st.text_input(
-            "YouTube URL:",
+        # URL input (one URL per line for batch summarization)
+        st.subheader("Enter YouTube Video URLs")
+        urls_text = st.text_area(
+            "YouTube URLs (one per line):",
             placeholder="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            help="Paste the URL of the YouTube video you want to summarize"
+            help="Paste the URLs of the YouTube videos you want to summarize, one per line"
+        )
+        youtube_urls = [line.strip() for line in urls_text.splitlines() if line.strip()]
+        
+        # Validate every URL and extract its video ID in a single scan
+        parsed_urls = {youtube_url: parse_youtube_url(youtube_url) for youtube_url in youtube_urls}
+        
+        # Summary style (changing it and summarizing again reuses the uploaded transcript)
+        summary_style = st.selectbox(
+            "Summary style:",
+            options=list(SUMMARY_STYLES),
+            index=list(SUMMARY_STYLES).index(DEFAULT_SUMMARY_STYLE)
         )
         
         # Summarize button
@@ -150,100 +636,137 @@ def main():
     
     with col2:
         # Status indicators
-        if youtube_url:
-            if validate_youtube_url(youtube_url):
-                st.success("✅ Valid YouTube URL")
+        for youtube_url in youtube_urls:
+            if parsed_urls[youtube_url]:
+                st.success(f"✅ Valid YouTube URL: {youtube_url}")
             else:
-                st.error("❌ Invalid YouTube URL")
+                st.error(f"❌ Invalid YouTube URL: {youtube_url}")
     
-    # Process video when button is clicked
+    # Process videos when button is clicked
     if summarize_button:
-        if not youtube_url:
+        if not youtube_urls:
             st.error("Please enter a YouTube URL.")
             return
         
-        if not validate_youtube_url(youtube_url):
-            st.error("Please enter a valid YouTube URL.")
-            return
-        
-        # Extract video ID
-        video_id = extract_video_id(youtube_url)
-        if not video_id:
-            st.error("Could not extract video ID from the URL. Please check the URL format.")
+        invalid_urls = [url for url in youtube_urls if not parsed_urls[url]]
+        if invalid_urls:
+            st.error(f"Please enter valid YouTube URLs. Invalid: {', '.join(invalid_urls)}")
             return
         
-        # Show video information
-        st.subheader("Video Information")
-        video_title = get_video_title(video_id)
-        st.info(f"**Video:** {video_title}")
+        # Collect video IDs (duplicates are summarized once)
+        video_ids = list(dict.fromkeys(parsed_urls[url] for url in youtube_urls))
         
         # Progress indicator
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        # Step 1: Extract transcript
-        status_text.text("Extracting transcript...")
-        progress_bar.progress(33)
+        # Reuse previous results without hitting YouTube or Gemini
+        results = {}
+        for video_id in video_ids:
+            cached_result = recall_result(video_id, summary_style)
+            if cached_result is not None:
+                results[video_id] = cached_result
         
-        transcript_text, error = get_video_transcript(video_id)
+        pending_ids = [video_id for video_id in video_ids if video_id not in results]
+        transcripts = {}
+        errors = {}
         
-        if error:
-            st.error(f"❌ {error}")
-            return
+        if pending_ids:
+            # Step 1: Extract all transcripts concurrently (Gemini connection warms up meanwhile)
+            status_text.text("Extracting transcripts...")
+            progress_bar.progress(10)
+            
+            fetched = asyncio.run(fetch_transcripts_with_warmup(pending_ids))
+            for video_id, (transcript_lines, error) in fetched.items():
+                if error or not transcript_lines:
+                    errors[video_id] = error or "No transcript found for this video."
+                else:
+                    transcripts[video_id] = transcript_lines
         
-        if not transcript_text:
-            st.error("No transcript found for this video.")
-            return
+        # Near-duplicates of earlier videos reuse that summary for this session only; it was
+        # generated for another video, so it is never cached as this video's own result
+        # Several new videos are generated as structured output, a single one is streamed
+        structured = len(transcripts) > 1
+        candidate_ids = list(transcripts) if transcripts and has_similar_candidates() else []
+        for video_id in candidate_ids:
+            similar_summary = find_similar_summary(transcripts[video_id], summary_style, structured)
+            if similar_summary is not None:
+                results[video_id] = (similar_summary, transcripts.pop(video_id))
         
-        # Step 2: Generate summary
-        status_text.text("Generating AI summary...")
-        progress_bar.progress(66)
+        # Step 2: Several new videos are summarized concurrently; a single one is streamed
+        if len(transcripts) > 1:
+            status_text.text(f"Generating {len(transcripts)} AI summaries...")
+            progress_bar.progress(40)
+            
+            generated = asyncio.run(generate_summaries(transcripts, summary_style))
+            for video_id, (summary, error) in generated.items():
+                if error:
+                    errors[video_id] = error
+                else:
+                    results[video_id] = (summary, transcripts[video_id])
+                    store_result(video_id, summary_style, summary, transcripts[video_id])
         
-        summary = generate_summary(transcript_text)
+        # Display results in the order the URLs were entered
+        succeeded = 0
+        for video_id in video_ids:
+            if video_id in errors:
+                render_video_error(video_id, errors[video_id])
+                continue
+            
+            if video_id in results:
+                summary, transcript_lines = results[video_id]
+                remember_result(video_id, summary_style, summary, transcript_lines)
+                render_video_result(video_id, summary, transcript_lines)
+                succeeded += 1
+                continue
+            
+            status_text.text("Generating AI summary...")
+            progress_bar.progress(40)
+            
+            transcript_lines = transcripts[video_id]
+            summary, error = render_video_result(
+                video_id,
+                stream_summary(" ".join(transcript_lines), video_id, summary_style),
+                transcript_lines
+            )
+            
+            if error:
+                # Recorded so reruns show the failure instead of silently dropping the video
+                errors[video_id] = error
+            else:
+                store_result(video_id, summary_style, summary, transcript_lines)
+                succeeded += 1
         
         # Step 3: Complete
         status_text.text("Complete!")
         progress_bar.progress(100)
         
-        # Display results
-        st.success("✅ Summary generated successfully!")
-        
-        # Create tabs for transcript and summary
-        tab1, tab2 = st.tabs(["📝 AI Summary", "📄 Full Transcript"])
-        
-        with tab1:
-            st.subheader("AI-Generated Summary")
-            st.markdown(summary)
-            
-            # Download summary button
-            st.download_button(
-                label="📥 Download Summary",
-                data=summary,
-                file_name=f"youtube_summary_{video_id}.txt",
-                mime="text/plain"
-            )
-        
-        with tab2:
-            st.subheader("Full Transcript")
-            with st.expander("View Full Transcript", expanded=False):
-                st.text_area(
-                    "Transcript:",
-                    value=transcript_text,
-                    height=400,
-                    disabled=True
-                )
-            
-            # Download transcript button
-            st.download_button(
-                label="📥 Download Transcript",
-                data=transcript_text,
-                file_name=f"youtube_transcript_{video_id}.txt",
-                mime="text/plain"
-            )
+        if succeeded:
+            st.success(f"✅ Generated {succeeded} of {len(video_ids)} summaries successfully!")
         
         # Clear progress indicators
         progress_bar.empty()
         status_text.empty()
+        
+        # Remember what was shown so later reruns can redraw it without recomputing
+        st.session_state["last_request"] = {
+            "video_ids": video_ids,
+            "style": summary_style,
+            "errors": errors,
+        }
+    
+    # Other interactions (download clicks, toggles) rerun the script; redraw the last results
+    elif "last_request" in st.session_state:
+        last_request = st.session_state["last_request"]
+        for video_id in last_request["video_ids"]:
+            if video_id in last_request["errors"]:
+                render_video_error(video_id, last_request["errors"][video_id])
+                continue
+            
+            result = recall_result(video_id, last_request["style"])
+            if result is not None:
+                summary, transcript_lines = result
+                render_video_result(video_id, summary, transcript_lines)
     
     # Footer
     st.markdown("---")
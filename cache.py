@@ -0,0 +1,94 @@
+import os
+import gzip
+import json
+import diskcache
+import redis
+import streamlit as st
+
+# Cached summaries are kept for 30 days
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# Local fallback used when no shared Redis instance is configured
+LOCAL_CACHE_DIR = "./.summary_cache"
+
+# Cache calls give up on Redis after this long and count as a miss
+REDIS_TIMEOUT_SECONDS = 1
+
+# Fastest gzip level: still shrinks transcript text ~4x for a few hundred microseconds
+COMPRESS_LEVEL = 1
+
+@st.cache_resource
+def get_backend():
+    """
+    Connect to the shared Redis cache if REDIS_URL is set, otherwise open the local disk cache
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            # Short timeouts so an unreachable Redis costs a second per call, not a hang
+            return redis.Redis.from_url(
+                redis_url,
+                socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+                socket_timeout=REDIS_TIMEOUT_SECONDS
+            )
+        except ValueError:
+            # A malformed REDIS_URL should not take the app down; use the local cache instead
+            pass
+    return diskcache.Cache(LOCAL_CACHE_DIR)
+
+def encode_value(value):
+    """
+    Serialize a JSON-compatible value to gzip-compressed bytes
+    """
+    return gzip.compress(json.dumps(value).encode("utf-8"), compresslevel=COMPRESS_LEVEL)
+
+def decode_value(payload):
+    """
+    Inverse of encode_value
+    """
+    return json.loads(gzip.decompress(payload).decode("utf-8"))
+
+def get_cached(key):
+    """
+    Return the cached value for key, or None on a miss
+    """
+    backend = get_backend()
+    try:
+        payload = backend.get(key)
+    except redis.RedisError:
+        # An unreachable cache is treated as a miss rather than an error
+        return None
+
+    if payload is None:
+        return None
+    if not isinstance(payload, bytes):
+        # Entries written before compression was added are stored as plain objects
+        return payload
+    return decode_value(payload)
+
+def set_cached(key, value):
+    """
+    Store a JSON-serializable value (gzip-compressed) under key for CACHE_TTL_SECONDS
+    """
+    backend = get_backend()
+    payload = encode_value(value)
+    if isinstance(backend, redis.Redis):
+        try:
+            backend.set(key, payload, ex=CACHE_TTL_SECONDS)
+        except redis.RedisError:
+            pass
+        return
+
+    backend.set(key, payload, expire=CACHE_TTL_SECONDS)
+
+def get_or_set(key, compute):
+    """
+    Return the cached value for key, computing and storing it on a miss
+    """
+    value = get_cached(key)
+    if value is None:
+        value = compute()
+        # Empty results are not cached so they are retried next time
+        if value:
+            set_cached(key, value)
+    return value
@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import threading
+import numpy as np
+import faiss
+import streamlit as st
+from sentence_transformers import SentenceTransformer
+
+# Small, fast sentence embedding model used to compare transcripts
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Size of one EMBEDDING_MODEL_NAME vector, so the index can be opened without the model
+EMBEDDING_DIMENSION = 384
+
+# The model only reads ~256 word pieces (~1000 characters), so the transcript is
+# sampled at its start, middle and end instead of embedding just the opening
+SAMPLE_CHARS = 1000
+SAMPLE_COUNT = 3
+
+# Mean cosine similarity of the samples above which two transcripts are the same video
+SIMILARITY_THRESHOLD = 0.92
+
+# Re-uploads and trims barely change the length; different episodes usually do
+LENGTH_RATIO_THRESHOLD = 0.9
+
+# Number of nearest neighbours checked for an entry with the same summary key
+SEARCH_CANDIDATES = 10
+
+# Entries expire like the summary cache and the store never grows past a fixed size
+ENTRY_TTL_SECONDS = 30 * 24 * 3600
+MAX_ENTRIES = 5000
+
+# On-disk location of the FAISS index and the summaries it points to
+CACHE_DIR = "./.semantic_cache"
+INDEX_PATH = os.path.join(CACHE_DIR, "index.faiss")
+ENTRIES_PATH = os.path.join(CACHE_DIR, "entries.json")
+
+@st.cache_resource
+def get_embedding_model():
+    """
+    Load the sentence embedding model once and share it across reruns and sessions
+    """
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+@st.cache_resource
+def get_semantic_store():
+    """
+    Load the FAISS index and its entries from disk (or start empty) once per process
+    """
+    dimension = SAMPLE_COUNT * EMBEDDING_DIMENSION
+
+    index = None
+    entries = []
+    if os.path.exists(INDEX_PATH) and os.path.exists(ENTRIES_PATH):
+        index = faiss.read_index(INDEX_PATH)
+        with open(ENTRIES_PATH, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+
+    # Indexes written with a different embedding layout cannot be searched; start over
+    if index is None or index.d != dimension or index.ntotal != len(entries):
+        # Inner product on normalized embeddings is cosine similarity
+        index = faiss.IndexFlatIP(dimension)
+        entries = []
+
+    return {
+        "index": index,
+        "entries": entries,
+        "lock": threading.Lock(),
+        "persist_lock": threading.Lock(),
+        "version": 0,
+        "persisted_version": 0,
+    }
+
+def sample_transcript(transcript_text):
+    """
+    Take SAMPLE_COUNT evenly spaced excerpts (start, middle, end) of a transcript
+    """
+    last_start = max(len(transcript_text) - SAMPLE_CHARS, 0)
+    starts = [last_start * i // (SAMPLE_COUNT - 1) for i in range(SAMPLE_COUNT)]
+    return [transcript_text[start:start + SAMPLE_CHARS] for start in starts]
+
+def embed_transcript(transcript_text):
+    """
+    Embed a transcript as one float32 vector whose inner product is the mean sample similarity
+    """
+    model = get_embedding_model()
+    samples = model.encode(
+        sample_transcript(transcript_text),
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    )
+    return (samples.reshape(1, -1) / np.sqrt(SAMPLE_COUNT)).astype("float32")
+
+def is_live(entry, now):
+    """
+    Check whether an entry is still within its time to live
+    """
+    return now - entry["created_at"] < ENTRY_TTL_SECONDS
+
+def has_entries():
+    """
+    Check whether any summary is stored, without loading the embedding model
+    """
+    return get_semantic_store()["index"].ntotal > 0
+
+def lookup(transcript_text, key):
+    """
+    Return the cached summary of a near-duplicate transcript with the same key, or None
+    """
+    store = get_semantic_store()
+    # Embedding is the slow part (and the first call loads the model); skip it when empty
+    if store["index"].ntotal == 0:
+        return None
+    embedding = embed_transcript(transcript_text)
+    now = time.time()
+
+    with store["lock"]:
+        if store["index"].ntotal == 0:
+            return None
+
+        k = min(SEARCH_CANDIDATES, store["index"].ntotal)
+        scores, ids = store["index"].search(embedding, k)
+        for score, entry_id in zip(scores[0], ids[0]):
+            if score < SIMILARITY_THRESHOLD:
+                break
+            entry = store["entries"][entry_id]
+            lengths = sorted([entry["length"], len(transcript_text)])
+            if (entry["key"] == key and is_live(entry, now)
+                    and lengths[0] >= LENGTH_RATIO_THRESHOLD * lengths[1]):
+                return entry["summary"]
+
+    return None
+
+def add(transcript_text, key, summary):
+    """
+    Store a summary under the embedding of its transcript and persist the index
+    """
+    store = get_semantic_store()
+    embedding = embed_transcript(transcript_text)
+    now = time.time()
+
+    with store["lock"]:
+        index = store["index"]
+        entries = store["entries"]
+        index.add(embedding)
+        entries.append({
+            "key": key,
+            "summary": summary,
+            "length": len(transcript_text),
+            "created_at": now,
+        })
+
+        # Entries are in insertion order, so expired and over-cap entries are at the front
+        drop = max(len(entries) - MAX_ENTRIES, 0)
+        while drop < len(entries) and not is_live(entries[drop], now):
+            drop += 1
+        if drop:
+            index.remove_ids(np.arange(drop, dtype="int64"))
+            del entries[:drop]
+
+        # Snapshot in memory so the slow disk write happens outside the lookup lock
+        store["version"] += 1
+        version = store["version"]
+        index_bytes = faiss.serialize_index(index).tobytes()
+        entries_json = json.dumps(entries)
+
+    with store["persist_lock"]:
+        # A newer snapshot may already be on disk if another add finished first
+        if version < store["persisted_version"]:
+            return
+
+        # Write to temporary files first so a crash never leaves a half-written cache
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(INDEX_PATH + ".tmp", "wb") as f:
+            f.write(index_bytes)
+        with open(ENTRIES_PATH + ".tmp", "w", encoding="utf-8") as f:
+            f.write(entries_json)
+        os.replace(INDEX_PATH + ".tmp", INDEX_PATH)
+        os.replace(ENTRIES_PATH + ".tmp", ENTRIES_PATH)
+        store["persisted_version"] = version
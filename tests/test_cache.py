@@ -0,0 +1,20 @@
+import os
+import sys
+import pytest
+
+# cache.py imports its storage backends at module level; skip when they are not installed
+for module in ("streamlit", "diskcache", "redis"):
+    pytest.importorskip(module)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import encode_value, decode_value
+
+def test_encode_decode_round_trip():
+    value = {"text": "Transcript ünïcode text. " * 200, "parts": [1, 2, 3], "ok": True}
+
+    payload = encode_value(value)
+
+    assert isinstance(payload, bytes)
+    assert len(payload) < len(value["text"])
+    assert decode_value(payload) == value
@@ -0,0 +1,60 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_utils import parse_youtube_url, compact_transcript, split_transcript
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+def test_parse_watch_url_with_extra_params():
+    assert parse_youtube_url(f"https://www.youtube.com/watch?v={VIDEO_ID}") == VIDEO_ID
+    assert parse_youtube_url(f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}&t=42s") == VIDEO_ID
+    assert parse_youtube_url(f"https://m.youtube.com/watch?v={VIDEO_ID}&list=PL123") == VIDEO_ID
+
+def test_parse_short_and_embed_urls():
+    assert parse_youtube_url(f"https://youtu.be/{VIDEO_ID}") == VIDEO_ID
+    assert parse_youtube_url(f"https://youtu.be/{VIDEO_ID}?si=AbCdEfGhIjKlMnOp") == VIDEO_ID
+    assert parse_youtube_url(f"https://www.youtube.com/embed/{VIDEO_ID}") == VIDEO_ID
+
+def test_parse_rejects_invalid_urls():
+    assert parse_youtube_url(f"https://notyoutube.com/watch?v={VIDEO_ID}") is None
+    assert parse_youtube_url(f"https://youtube.com.evil.com/watch?v={VIDEO_ID}") is None
+    assert parse_youtube_url(f"https://vimeo.com/{VIDEO_ID}") is None
+    assert parse_youtube_url(f"https://www.youtube.com/watch?v={VIDEO_ID}extra") is None
+    assert parse_youtube_url("https://www.youtube.com/watch?v=short") is None
+    assert parse_youtube_url("not a url") is None
+
+def test_compact_transcript_strips_fillers_and_repeats():
+    assert compact_transcript("So, um, this is the the the plan.") == "So this is the plan."
+    assert compact_transcript("We   went\nhome.") == "We went home."
+
+def test_compact_transcript_strips_filler_at_sentence_start():
+    assert compact_transcript("Um... I think so") == "I think so"
+    assert compact_transcript("Right. Uh, let's go.") == "Right. let's go."
+    assert compact_transcript("We stopped, um. Then we left.") == "We stopped. Then we left."
+
+def test_compact_transcript_keeps_hyphenated_fillers():
+    assert compact_transcript("uh-huh yes") == "uh-huh yes"
+
+def test_compact_transcript_keeps_meaningful_repeats():
+    assert compact_transcript("He had had enough") == "He had had enough"
+    assert compact_transcript("I know that that is true") == "I know that that is true"
+    assert compact_transcript("New York New York") == "New York New York"
+    assert compact_transcript("The score was 2 2 at half time.") == "The score was 2 2 at half time."
+
+def test_compact_transcript_keeps_sentence_ends():
+    assert compact_transcript("That is it. Next topic.") == "That is it. Next topic."
+
+def test_split_transcript_keeps_order_around_long_sentence():
+    words = " ".join(f"w{i}" for i in range(30))
+    transcript = f"Intro sentence here. {words}. Outro."
+
+    parts = split_transcript(transcript, chunk_chars=40)
+
+    assert parts[0] == "Intro sentence here."
+    assert all(len(part) <= 40 for part in parts)
+    assert " ".join(parts) == transcript
+
+def test_split_transcript_short_text_is_one_part():
+    assert split_transcript("One. Two. Three.", chunk_chars=100) == ["One. Two. Three."]
@@ -0,0 +1,81 @@
+import re
+
+# Single precompiled pattern that both validates a YouTube URL and captures its video ID
+YOUTUBE_URL_PATTERN = re.compile(
+    r'^https?://(?:(?:www\.|m\.)?youtube\.com/(?:watch\?(?:.*&)?v=|embed/|v/)|youtu\.be/)'
+    r'([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])',
+    re.IGNORECASE
+)
+
+# Long transcripts are split into ~8k-token parts and summarized with map-reduce
+TRANSCRIPT_CHUNK_CHARS = 32000
+
+# Sentence ends and line breaks, used to split transcripts on natural boundaries
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Spoken filler words that add tokens but no information ("like" and "you know" are
+# left alone because they often carry meaning). A filler touching a hyphen is part of a
+# word ("uh-huh") and is kept
+FILLER_WORD = r'(?<![-\w])(?:u+h+|u+m+|uhm|erm)(?![-\w])'
+
+# A filler opening a sentence is removed with the punctuation after it ("Um... so" -> "so")
+LEADING_FILLER_PATTERN = re.compile(
+    rf'(?:^|(?<=[.!?\u2026]))\s*{FILLER_WORD}(?:[,.!?\u2026]+)?',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Elsewhere only the commas that set a filler off are removed with it, so sentence-ending
+# periods (and split_transcript's boundaries) survive
+FILLER_WORD_PATTERN = re.compile(rf'(?:,\s*)?{FILLER_WORD},?', re.IGNORECASE)
+
+# A word or phrase of up to three words repeated three or more times back to back, as
+# auto-captions often do. Doubles are left alone because they are often real ("had had",
+# "that that", "New York New York"), and only letters count, so repeated numbers
+# ("the score was 2 2") are kept
+REPEATED_PHRASE_PATTERN = re.compile(
+    r'\b([^\W\d_]+(?:\s+[^\W\d_]+){0,2})(?:\s+\1\b){2,}', re.IGNORECASE
+)
+
+def parse_youtube_url(youtube_url):
+    """
+    Validate a YouTube URL and extract its video ID in one pass (None if invalid)
+    """
+    match = YOUTUBE_URL_PATTERN.match(youtube_url)
+    return match.group(1) if match else None
+
+def compact_transcript(transcript_text):
+    """
+    Strip filler words and back-to-back repeated phrases to cut prompt tokens
+    """
+    transcript_text = LEADING_FILLER_PATTERN.sub(" ", transcript_text)
+    transcript_text = FILLER_WORD_PATTERN.sub("", transcript_text)
+    transcript_text = REPEATED_PHRASE_PATTERN.sub(r"\1", transcript_text)
+    return " ".join(transcript_text.split())
+
+def split_transcript(transcript_text, chunk_chars=TRANSCRIPT_CHUNK_CHARS):
+    """
+    Split a transcript into parts of at most chunk_chars, breaking on sentence boundaries
+    """
+    parts = []
+    current = ""
+    for sentence in SENTENCE_BOUNDARY_PATTERN.split(transcript_text):
+        # Unpunctuated auto-captions can run longer than a chunk; cut those on a space,
+        # flushing the pending text first so parts stay in transcript order
+        if current and len(sentence) > chunk_chars:
+            parts.append(current)
+            current = ""
+        while len(sentence) > chunk_chars:
+            cut = sentence.rfind(" ", 0, chunk_chars)
+            if cut <= 0:
+                cut = chunk_chars
+            parts.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+
+        if current and len(current) + len(sentence) + 1 > chunk_chars:
+            parts.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        parts.append(current)
+    return parts